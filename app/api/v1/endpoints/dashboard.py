@@ -192,7 +192,7 @@ async def get_dashboard_overview(
     )
     
     # 缓存结果
-    await redis_client.set(cache_key, overview.dict(), expire=1800)  # 30分钟缓存
+    await redis_client.set(cache_key, overview.dict(), expire=1800, wait=False)  # 30分钟缓存
     
     return BaseResponse(
         data=overview,
@@ -246,7 +246,7 @@ async def get_project_status_chart(
     )
     
     # 缓存结果
-    await redis_client.set(cache_key, chart.dict(), expire=1800)
+    await redis_client.set(cache_key, chart.dict(), expire=1800, wait=False)
     
     return BaseResponse(
         data=chart,
@@ -307,7 +307,7 @@ async def get_task_priority_chart(
     )
     
     # 缓存结果
-    await redis_client.set(cache_key, chart.dict(), expire=1800)
+    await redis_client.set(cache_key, chart.dict(), expire=1800, wait=False)
     
     return BaseResponse(
         data=chart,
@@ -425,7 +425,7 @@ async def get_recent_activities(
     await redis_client.set(
         cache_key, 
         [activity.dict() for activity in activities], 
-        expire=900  # 15分钟缓存
+        expire=900, wait=False  # 15分钟缓存
     )
     
     return BaseResponse(
@@ -528,7 +528,7 @@ async def get_progress_trend(
     await redis_client.set(
         cache_key,
         [trend.dict() for trend in trends],
-        expire=3600  # 1小时缓存
+        expire=3600, wait=False  # 1小时缓存
     )
     
     return BaseResponse(
@@ -619,7 +619,7 @@ async def get_top_performers(
     await redis_client.set(
         cache_key,
         [performer.dict() for performer in performers],
-        expire=3600  # 1小时缓存
+        expire=3600, wait=False  # 1小时缓存
     )
     
     return BaseResponse(
@@ -671,7 +671,7 @@ async def get_dashboard_data(
     )
     
     # 缓存结果
-    await redis_client.set(cache_key, dashboard_data.dict(), expire=1800)  # 30分钟缓存
+    await redis_client.set(cache_key, dashboard_data.dict(), expire=1800, wait=False)  # 30分钟缓存
     
     return BaseResponse(
         data=dashboard_data,
@@ -147,15 +147,14 @@ async def get_export_tasks(
     current_user: User = Depends(check_permission("export:list"))
 ):
     """获取导出任务列表"""
-    # 从 Redis 获取用户的导出任务
-    pattern = f"export_task:*"
-    keys = await redis_client.keys(pattern)
+    # 从 Redis 获取用户的导出任务（SCAN遍历键，再批量MGET取值）
+    keys = await redis_client.scan_keys("export_task:*")
     
-    tasks = []
-    for key in keys:
-        task_data = await redis_client.get(key)
-        if task_data:
-            tasks.append(ExportTask(**task_data))
+    tasks = [
+        ExportTask(**task_data)
+        for task_data in await redis_client.mget(keys)
+        if task_data
+    ]
     
     # 按创建时间排序
     tasks.sort(key=lambda x: x.created_at, reverse=True)
@@ -645,10 +644,14 @@ async def generate_csv_file(file_path: Path, data: List[Dict]):
         for row in data:
             writer.writerow(row)
 
+def dump_json_bytes(data: List[Dict]) -> bytes:
+    """将导出数据序列化为带缩进的UTF-8 JSON字节"""
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
 async def generate_json_file(file_path: Path, data: List[Dict]):
     """生成 JSON 文件"""
-    with open(file_path, 'w', encoding='utf-8') as jsonfile:
-        json.dump(data, jsonfile, ensure_ascii=False, indent=2)
+    with open(file_path, 'wb') as jsonfile:
+        jsonfile.write(dump_json_bytes(data))
 
 async def generate_excel_file(file_path: Path, data: List[Dict]):
     """生成 Excel 文件"""
@@ -688,7 +691,7 @@ async def export_to_csv_stream(data: List[Dict], export_type: ExportType) -> Str
 async def export_to_json_stream(data: List[Dict]) -> StreamingResponse:
     """导出为 JSON 流"""
     def iter_json():
-        yield json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        yield dump_json_bytes(data)
     
     filename = f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     
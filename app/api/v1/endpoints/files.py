@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 import os
 import uuid
+import logging
 import aiofiles
 from datetime import datetime
 from typing import List, Optional
@@ -18,6 +19,7 @@ from app.models.file import File as FileModel
 from app.schemas.base import BaseResponse, PaginationParams, PaginationResponse
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # 文件相关的 Pydantic 模式
 from pydantic import BaseModel, Field
@@ -65,16 +67,20 @@ ALLOWED_EXTENSIONS = {
     'audio': ['.mp3', '.wav', '.flac', '.aac']
 }
 
+# 扩展名查找表，导入时构建一次，上传校验为O(1)查找
+EXTENSION_TO_TYPE = {
+    extension: file_type
+    for file_type, extensions in ALLOWED_EXTENSIONS.items()
+    for extension in extensions
+}
+ALL_ALLOWED_EXTENSIONS = frozenset(EXTENSION_TO_TYPE)
+
 # 最大文件大小（字节）
 MAX_FILE_SIZE = settings.MAX_FILE_SIZE
 
 def get_file_type(extension: str) -> str:
     """根据文件扩展名获取文件类型"""
-    extension = extension.lower()
-    for file_type, extensions in ALLOWED_EXTENSIONS.items():
-        if extension in extensions:
-            return file_type
-    return 'other'
+    return EXTENSION_TO_TYPE.get(extension.lower(), 'other')
 
 def is_allowed_file(filename: str) -> bool:
     """检查文件是否允许上传"""
@@ -82,11 +88,7 @@ def is_allowed_file(filename: str) -> bool:
         return False
     
     extension = '.' + filename.rsplit('.', 1)[1].lower()
-    all_extensions = []
-    for extensions in ALLOWED_EXTENSIONS.values():
-        all_extensions.extend(extensions)
-    
-    return extension in all_extensions
+    return extension in ALL_ALLOWED_EXTENSIONS
 
 async def save_upload_file(upload_file: UploadFile, upload_dir: str) -> tuple:
     """保存上传的文件"""
@@ -450,7 +452,7 @@ async def delete_file(
             os.remove(file.file_path)
         except Exception as e:
             # 记录日志但不阻止删除数据库记录
-            print(f"删除物理文件失败：{e}")
+            logger.warning("删除物理文件失败：%s", e)
     
     # 删除数据库记录
     await db.delete(file)
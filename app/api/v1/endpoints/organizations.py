@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, exists
 from sqlalchemy.orm import selectinload
 import json
 
@@ -265,7 +265,7 @@ async def get_organization(
     )
     
     # 缓存结果
-    await redis_client.set(cache_key, org_detail.dict(), expire=3600)
+    await redis_client.set(cache_key, org_detail.dict(), expire=3600, wait=False)
     
     return BaseResponse(
         data=org_detail,
@@ -355,12 +355,11 @@ async def delete_organization(
             detail="组织不存在"
         )
     
-    # 检查是否有子组织
-    children_result = await db.execute(
-        select(func.count(Organization.id)).where(Organization.parent_id == org_id)
+    # 检查是否有子组织（EXISTS找到第一行即返回，无需COUNT全部）
+    has_children = await db.scalar(
+        select(exists().where(Organization.parent_id == org_id))
     )
-    children_count = children_result.scalar()
-    if children_count > 0:
+    if has_children:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="存在子组织，无法删除"
@@ -368,11 +367,10 @@ async def delete_organization(
     
     # 检查是否有关联的项目
     from app.models.project import Project
-    projects_result = await db.execute(
-        select(func.count(Project.id)).where(Project.organization_id == org_id)
+    has_projects = await db.scalar(
+        select(exists().where(Project.organization_id == org_id))
     )
-    projects_count = projects_result.scalar()
-    if projects_count > 0:
+    if has_projects:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="存在关联的项目，无法删除"
@@ -502,7 +500,7 @@ async def get_organization_tree(
     tree = build_tree()
     
     # 缓存结果
-    await redis_client.set(cache_key, tree, expire=3600)
+    await redis_client.set(cache_key, tree, expire=3600, wait=False)
     
     return BaseResponse(
         data=tree,
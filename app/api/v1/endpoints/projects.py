@@ -267,7 +267,7 @@ async def get_project(
     )
     
     # 缓存项目详情
-    await redis_client.set(f"project:{project_id}", project_detail.dict(), expire=1800)
+    await redis_client.set(f"project:{project_id}", project_detail.dict(), expire=1800, wait=False)
     
     return BaseResponse(
         data=project_detail,
@@ -539,38 +539,34 @@ async def get_project_statistics(
     total_result = await db.execute(select(func.count(Project.id)))
     total = total_result.scalar()
     
-    # 按状态统计
-    status_counts = {}
-    for status in ProjectStatus:
-        count_result = await db.execute(
-            select(func.count(Project.id)).where(Project.status == status.value)
-        )
-        status_counts[status.value] = count_result.scalar()
-    
-    # 按优先级统计
-    priority_counts = {}
-    for priority in ProjectPriority:
-        count_result = await db.execute(
-            select(func.count(Project.id)).where(Project.priority == priority.value)
-        )
-        priority_counts[priority.value] = count_result.scalar()
-    
-    # 预算统计
-    budget_result = await db.execute(
-        select(func.sum(Project.budget)).where(Project.budget.isnot(None))
+    # 按状态统计（一次分组查询）
+    status_result = await db.execute(
+        select(Project.status, func.count(Project.id)).group_by(Project.status)
     )
-    total_budget = budget_result.scalar() or 0.0
+    grouped_status = {status: count for status, count in status_result.all()}
+    status_counts = {status.value: grouped_status.get(status.value, 0) for status in ProjectStatus}
     
-    cost_result = await db.execute(
-        select(func.sum(Project.actual_cost)).where(Project.actual_cost.isnot(None))
+    # 按优先级统计（一次分组查询）
+    priority_result = await db.execute(
+        select(Project.priority, func.count(Project.id)).group_by(Project.priority)
     )
-    total_actual_cost = cost_result.scalar() or 0.0
-    
-    # 平均进度
-    progress_result = await db.execute(
-        select(func.avg(Project.progress)).where(Project.progress.isnot(None))
+    grouped_priority = {priority: count for priority, count in priority_result.all()}
+    priority_counts = {
+        priority.value: grouped_priority.get(priority.value, 0) for priority in ProjectPriority
+    }
+    
+    # 预算、成本和平均进度（一次扫描同时聚合，SUM/AVG本身忽略NULL）
+    aggregate_result = await db.execute(
+        select(
+            func.sum(Project.budget),
+            func.sum(Project.actual_cost),
+            func.avg(Project.progress)
+        )
     )
-    average_progress = progress_result.scalar() or 0.0
+    total_budget, total_actual_cost, average_progress = aggregate_result.one()
+    total_budget = total_budget or 0.0
+    total_actual_cost = total_actual_cost or 0.0
+    average_progress = average_progress or 0.0
     
     # 逾期项目数
     from datetime import datetime
@@ -599,7 +595,7 @@ async def get_project_statistics(
     )
     
     # 缓存统计数据
-    await redis_client.set("project_statistics", stats.dict(), expire=3600)
+    await redis_client.set("project_statistics", stats.dict(), expire=3600, wait=False)
     
     return BaseResponse(
         data=stats,
@@ -161,7 +161,7 @@ async def global_search(
     )
     
     # 缓存结果
-    await redis_client.set(cache_key, search_response.dict(), expire=300)  # 5分钟缓存
+    await redis_client.set(cache_key, search_response.dict(), expire=300, wait=False)  # 5分钟缓存
     
     return BaseResponse(
         data=search_response,
@@ -228,7 +228,7 @@ async def quick_search(
     )
     
     # 缓存结果
-    await redis_client.set(cache_key, quick_result.dict(), expire=180)  # 3分钟缓存
+    await redis_client.set(cache_key, quick_result.dict(), expire=180, wait=False)  # 3分钟缓存
     
     return BaseResponse(
         data=quick_result,
@@ -339,7 +339,7 @@ async def get_search_suggestions(
     suggestion_list = list(suggestions)[:limit]
     
     # 缓存结果
-    await redis_client.set(cache_key, suggestion_list, expire=600)  # 10分钟缓存
+    await redis_client.set(cache_key, suggestion_list, expire=600, wait=False)  # 10分钟缓存
     
     return BaseResponse(
         data=suggestion_list,
@@ -543,35 +543,17 @@ async def get_task_statistics(
     total_result = await db.execute(select(func.count()).select_from(base_query.subquery()))
     total = total_result.scalar()
     
-    # 按状态统计
-    by_status = {}
-    for status in TaskStatus:
-        count_result = await db.execute(
-            select(func.count()).select_from(
-                base_query.where(Task.status == status.value).subquery()
-            )
-        )
-        by_status[status.value] = count_result.scalar()
-    
-    # 按优先级统计
-    by_priority = {}
-    for priority in TaskPriority:
-        count_result = await db.execute(
-            select(func.count()).select_from(
-                base_query.where(Task.priority == priority.value).subquery()
-            )
-        )
-        by_priority[priority.value] = count_result.scalar()
-    
-    # 按类型统计
-    by_type = {}
-    for task_type in TaskType:
-        count_result = await db.execute(
-            select(func.count()).select_from(
-                base_query.where(Task.type == task_type.value).subquery()
-            )
-        )
-        by_type[task_type.value] = count_result.scalar()
+    # 按状态、优先级、类型统计（每个维度一次分组查询）
+    task_subquery = base_query.subquery()
+    
+    async def count_by(column, enum_cls) -> dict:
+        result = await db.execute(select(column, func.count()).group_by(column))
+        grouped = {value: count for value, count in result.all()}
+        return {item.value: grouped.get(item.value, 0) for item in enum_cls}
+    
+    by_status = await count_by(task_subquery.c.status, TaskStatus)
+    by_priority = await count_by(task_subquery.c.priority, TaskPriority)
+    by_type = await count_by(task_subquery.c.type, TaskType)
     
     # 逾期任务数
     from datetime import datetime
@@ -626,7 +608,7 @@ async def get_task_statistics(
     )
     
     # 缓存统计数据
-    await redis_client.set(cache_key, stats.dict(), expire=1800)
+    await redis_client.set(cache_key, stats.dict(), expire=1800, wait=False)
     
     return BaseResponse(
         data=stats,
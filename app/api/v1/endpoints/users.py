@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 
 from app.core.database import get_db
 from app.core.auth import get_current_user, check_permission, get_password_hash
-from app.core.redis_client import redis_client
+from app.core.redis_client import redis_client, NEGATIVE_CACHE
 from app.models.user import User
 from app.schemas.user import (
     UserCreate, UserUpdate, UserResponse, UserStatistics, 
@@ -144,8 +144,16 @@ async def get_user(
     current_user: User = Depends(check_permission("user:view"))
 ):
     """获取用户详情"""
-    # 先从缓存获取
-    cached_user = await redis_client.get(f"user:{user_id}")
+    # 先从缓存获取（负缓存使用独立的键，user:{id}中只存放用户数据，
+    # get_current_user等其他读取方无需识别负缓存标记）
+    cached_user, missing_marker = await redis_client.mget(
+        [f"user:{user_id}", f"user:missing:{user_id}"]
+    )
+    if cached_user is None and missing_marker is NEGATIVE_CACHE:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="用户不存在"
+        )
     if cached_user:
         return BaseResponse(
             data=UserResponse(**cached_user),
@@ -157,6 +165,12 @@ async def get_user(
     user = result.scalar_one_or_none()
     
     if not user:
+        # 短时间缓存不存在的结果，避免重复查询
+        await redis_client.set(
+            f"user:missing:{user_id}",
+            NEGATIVE_CACHE,
+            expire=settings.NEGATIVE_CACHE_EXPIRE_SECONDS, wait=False
+        )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="用户不存在"
@@ -275,73 +289,66 @@ async def get_user_statistics(
     current_user: User = Depends(check_permission("user:view"))
 ):
     """获取用户统计信息"""
-    # 检查缓存
-    cached_stats = await redis_client.get("user_statistics")
-    if cached_stats:
-        return BaseResponse(
-            data=UserStatistics(**cached_stats),
-            message="获取成功"
+    async def load_statistics() -> dict:
+        # 总用户数
+        total_result = await db.execute(select(func.count(User.id)))
+        total = total_result.scalar()
+    
+        # 按角色统计
+        role_result = await db.execute(
+            select(User.role, func.count(User.id)).group_by(User.role)
         )
+        by_role = {role: count for role, count in role_result.all()}
     
-    # 总用户数
-    total_result = await db.execute(select(func.count(User.id)))
-    total = total_result.scalar()
-    
-    # 按角色统计
-    role_result = await db.execute(
-        select(User.role, func.count(User.id)).group_by(User.role)
-    )
-    by_role = {role: count for role, count in role_result.all()}
+        # 按状态统计
+        status_result = await db.execute(
+            select(User.status, func.count(User.id)).group_by(User.status)
+        )
+        by_status = {status: count for status, count in status_result.all()}
     
-    # 按状态统计
-    status_result = await db.execute(
-        select(User.status, func.count(User.id)).group_by(User.status)
-    )
-    by_status = {status: count for status, count in status_result.all()}
+        # 按部门统计
+        dept_result = await db.execute(
+            select(User.department, func.count(User.id))
+            .where(User.department.isnot(None))
+            .group_by(User.department)
+        )
+        by_department = {dept: count for dept, count in dept_result.all()}
     
-    # 按部门统计
-    dept_result = await db.execute(
-        select(User.department, func.count(User.id))
-        .where(User.department.isnot(None))
-        .group_by(User.department)
-    )
-    by_department = {dept: count for dept, count in dept_result.all()}
+        # 活跃用户数
+        active_result = await db.execute(
+            select(func.count(User.id)).where(User.status == "active")
+        )
+        active_users = active_result.scalar()
     
-    # 活跃用户数
-    active_result = await db.execute(
-        select(func.count(User.id)).where(User.status == "active")
-    )
-    active_users = active_result.scalar()
+        # 本月新用户
+        this_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        new_users_result = await db.execute(
+            select(func.count(User.id)).where(User.created_at >= this_month)
+        )
+        new_users_this_month = new_users_result.scalar()
     
-    # 本月新用户
-    this_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    new_users_result = await db.execute(
-        select(func.count(User.id)).where(User.created_at >= this_month)
-    )
-    new_users_this_month = new_users_result.scalar()
+        # 最近登录用户（7天内）
+        week_ago = datetime.now() - timedelta(days=7)
+        last_login_result = await db.execute(
+            select(func.count(User.id)).where(User.last_login >= week_ago)
+        )
+        last_login_users = last_login_result.scalar()
     
-    # 最近登录用户（7天内）
-    week_ago = datetime.now() - timedelta(days=7)
-    last_login_result = await db.execute(
-        select(func.count(User.id)).where(User.last_login >= week_ago)
-    )
-    last_login_users = last_login_result.scalar()
-    
-    stats = UserStatistics(
-        total=total,
-        by_role=by_role,
-        by_status=by_status,
-        by_department=by_department,
-        active_users=active_users,
-        new_users_this_month=new_users_this_month,
-        last_login_users=last_login_users
-    )
+        return UserStatistics(
+            total=total,
+            by_role=by_role,
+            by_status=by_status,
+            by_department=by_department,
+            active_users=active_users,
+            new_users_this_month=new_users_this_month,
+            last_login_users=last_login_users
+        ).dict()
     
-    # 缓存统计数据
-    await redis_client.set("user_statistics", stats.dict(), expire=3600)
+    # 缓存未命中时只由一个请求回源统计，其余请求等待其结果
+    stats = await redis_client.get_or_set("user_statistics", load_statistics, expire=3600)
     
     return BaseResponse(
-        data=stats,
+        data=UserStatistics(**stats),
         message="获取成功"
     )
 
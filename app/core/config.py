@@ -1,7 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
-from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,6 +31,7 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
     REDIS_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+    REDIS_POOL_SIZE: int = 32  # 连接池最大连接数
     
     # JWT配置
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -54,6 +54,7 @@ class Settings(BaseSettings):
     
     # 缓存配置
     CACHE_EXPIRE_SECONDS: int = 3600  # 1小时
+    NEGATIVE_CACHE_EXPIRE_SECONDS: int = 5  # 不存在数据的负缓存时间
 
     # 日志配置
     LOG_LEVEL: str = "INFO"
@@ -80,11 +81,14 @@ class Settings(BaseSettings):
     def is_production(self) -> bool:
         return self.ENVIRONMENT == "production"
 
-    enable_rate_limiting: bool = True
+    # 限流中间件的Redis路径此前因缺少pipeline()从未生效，实际上没有限流；
+    # 默认关闭以保持现有行为，启用按IP限流需单独评审后再打开
+    enable_rate_limiting: bool = False
     rate_limit_requests_per_minute: int = 60
     rate_limit_burst_size: int = 100
     require_api_key: bool = False
     enable_response_caching: bool = False
+    cache_ttl: int = 300  # 响应缓存时间（秒）
     is_development: bool = False
     app_name: str = "My App"
     environment: str = "development"
@@ -112,7 +116,7 @@ class Settings(BaseSettings):
     
 
     class Config:
-        env_file = ".env"
+        # .env已由模块顶部的load_dotenv()加载进环境变量，这里不再重复读取解析
         case_sensitive = True
         extra = "ignore"
 
@@ -120,5 +124,5 @@ class Settings(BaseSettings):
 settings = Settings()
 
 # 根据环境切换数据库
-if os.getenv("ENVIRONMENT") == "production" and settings.MYSQL_URL:
+if settings.ENVIRONMENT == "production" and settings.MYSQL_URL:
     settings.DATABASE_URL = settings.MYSQL_URL
\ No newline at end of file
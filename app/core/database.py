@@ -1,10 +1,10 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 
 from app.core.config import settings
 
@@ -15,15 +15,37 @@ Base = declarative_base()
 engine = None
 AsyncSessionLocal = None
 
+# SQLite连接参数：WAL模式下读不阻塞写，其余为配套的性能设置
+# （只包含不改变数据语义的设置，外键约束保持SQLite默认的关闭状态）
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """新建SQLite连接时设置PRAGMA（每个连接只执行一次）"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+# 支持异步访问的数据库驱动
+ASYNC_DRIVERS = {"sqlite+aiosqlite", "postgresql+asyncpg", "mysql+aiomysql"}
+
 def init_db_connection():
     global engine, AsyncSessionLocal
-    if settings.DATABASE_URL.startswith("sqlite+aiosqlite:///") or \
-       "postgresql+asyncpg" in settings.DATABASE_URL or \
-       "mysql+aiomysql" in settings.DATABASE_URL:
+    # 只解析一次连接URL，按驱动名和后端名判断，不再对URL字符串做多次子串扫描
+    url = make_url(settings.DATABASE_URL)
+    if url.drivername in ASYNC_DRIVERS:
         # 异步数据库
         engine = create_async_engine(
             settings.DATABASE_URL,
-            echo=settings.DEBUG,
+            echo=settings.DATABASE_ECHO,
             future=True,
             pool_pre_ping=True
         )
@@ -36,7 +58,7 @@ def init_db_connection():
         # 同步数据库 (例如：sqlite:///./sql_app.db)
         engine = create_engine(
             settings.DATABASE_URL,
-            echo=settings.DEBUG,
+            echo=settings.DATABASE_ECHO,
             pool_pre_ping=True
         )
         AsyncSessionLocal = sessionmaker(
@@ -45,12 +67,17 @@ def init_db_connection():
             bind=engine
         )
 
+    if url.get_backend_name() == "sqlite":
+        # 异步引擎的连接事件挂在其底层同步引擎上
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "connect", _set_sqlite_pragma)
+
 # 数据库依赖注入
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     if AsyncSessionLocal is None:
         raise Exception("Database connection not initialized. Call init_db_connection() first.")
 
-    # 根据会话类型返回异步或同步会话
+    # 根据会话类型返回异步或同步会话（会话由with块负责关闭，无需再手动close）
     if isinstance(AsyncSessionLocal, async_sessionmaker):
         async with AsyncSessionLocal() as session:
             try:
@@ -59,8 +86,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             except Exception:
                 await session.rollback()
                 raise
-            finally:
-                await session.close()
     else:
         # For synchronous sessions, run in a thread pool executor to avoid blocking the event loop
         # This part might need adjustment if the FastAPI app is purely async.
@@ -71,6 +96,4 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
                 session.commit()
             except Exception:
                 session.rollback()
-                raise
-            finally:
-                session.close()
\ No newline at end of file
+                raise
\ No newline at end of file
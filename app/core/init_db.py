@@ -1,29 +1,34 @@
-from app.core.database import AsyncSessionLocal, engine
-from sqlalchemy import select
+from app.core.database import AsyncSessionLocal, Base, engine
+from sqlalchemy import select, insert, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.organization import Organization
-from app.models.project import Project
+from app.models.project import Project, project_members
 from app.models.task import Task
 from app.models.file import File
-from app.core.database import Base, engine
 import asyncio
 from datetime import datetime
+from itertools import cycle, repeat
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _create_all(sync_conn):
+    """创建所有表：空库时跳过逐表的存在性检查"""
+    has_tables = bool(inspect(sync_conn).get_table_names())
+    Base.metadata.create_all(sync_conn, checkfirst=has_tables)
+
 async def create_tables():
     """创建数据库表"""
     try:
         async with engine.begin() as conn:
             # 创建所有表
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_all)
         logger.info("数据库表创建成功")
     except Exception as e:
-        logger.error(f"创建数据库表失败: {e}")
+        logger.error("创建数据库表失败: %s", e)
         raise
 
 async def create_admin_user(db: AsyncSession):
@@ -36,7 +41,7 @@ async def create_admin_user(db: AsyncSession):
         existing_admin = result.scalar_one_or_none()
         
         if existing_admin:
-            logger.info(f"管理员用户 {settings.admin_username} 已存在")
+            logger.info("管理员用户 %s 已存在", settings.admin_username)
             return existing_admin
         
         # 创建管理员用户
@@ -53,14 +58,13 @@ async def create_admin_user(db: AsyncSession):
         )
         
         db.add(admin_user)
-        await db.commit()
-        await db.refresh(admin_user)
+        await db.flush()
         
-        logger.info(f"管理员用户 {settings.admin_username} 创建成功")
+        logger.info("管理员用户 %s 创建成功", settings.admin_username)
         return admin_user
         
     except Exception as e:
-        logger.error(f"创建管理员用户失败: {e}")
+        logger.error("创建管理员用户失败: %s", e)
         await db.rollback()
         raise
 
@@ -117,24 +121,19 @@ async def create_sample_organization(db: AsyncSession, admin_user: User):
                 type=dept_data["type"],
                 parent_id=root_org.id
             )
-            db.add(dept)
             created_departments.append(dept)
+        db.add_all(created_departments)
         
         # 将管理员添加到根组织
         root_org.members.append(admin_user)
         
-        await db.commit()
-        
-        # 刷新所有对象
-        await db.refresh(root_org)
-        for dept in created_departments:
-            await db.refresh(dept)
+        await db.flush()
         
         logger.info("示例组织创建成功")
         return root_org
         
     except Exception as e:
-        logger.error(f"创建示例组织失败: {e}")
+        logger.error("创建示例组织失败: %s", e)
         await db.rollback()
         raise
 
@@ -179,16 +178,25 @@ async def create_sample_users(db: AsyncSession, organization: Organization):
             }
         ]
         
+        # 一次IN查询取出所有已存在的用户，避免逐个查询
+        result = await db.execute(
+            select(User).where(User.username.in_([u["username"] for u in sample_users_data]))
+        )
+        existing_users = {user.username: user for user in result.scalars()}
+        
+        # bcrypt哈希是CPU密集操作且会释放GIL，新用户的密码在线程中并行计算
+        new_count = sum(u["username"] not in existing_users for u in sample_users_data)
+        password_hashes = iter(await asyncio.gather(*(
+            asyncio.to_thread(get_password_hash, "password123") for _ in range(new_count)
+        )))
+        
         created_users = []
+        new_users = []
         for user_data in sample_users_data:
-            # 检查用户是否已存在
-            result = await db.execute(
-                select(User).where(User.username == user_data["username"])
-            )
-            existing_user = result.scalar_one_or_none()
+            existing_user = existing_users.get(user_data["username"])
             
             if existing_user:
-                logger.info(f"用户 {user_data['username']} 已存在")
+                logger.info("用户 %s 已存在", user_data['username'])
                 created_users.append(existing_user)
                 continue
             
@@ -196,30 +204,27 @@ async def create_sample_users(db: AsyncSession, organization: Organization):
                 username=user_data["username"],
                 name=user_data["name"],
                 email=user_data["email"],
-                hashed_password=get_password_hash("password123"),
+                hashed_password=next(password_hashes),
                 role=user_data["role"],
                 status="active",
                 department=user_data["department"],
                 is_verified=True
             )
             
-            db.add(user)
+            new_users.append(user)
             created_users.append(user)
             
             # 将用户添加到组织
             organization.members.append(user)
         
-        await db.commit()
-        
-        # 刷新所有用户对象
-        for user in created_users:
-            await db.refresh(user)
+        db.add_all(new_users)
+        await db.flush()
         
-        logger.info(f"创建了 {len(created_users)} 个示例用户")
+        logger.info("创建了 %s 个示例用户", len(created_users))
         return created_users
         
     except Exception as e:
-        logger.error(f"创建示例用户失败: {e}")
+        logger.error("创建示例用户失败: %s", e)
         await db.rollback()
         raise
 
@@ -228,6 +233,9 @@ async def create_sample_projects(db: AsyncSession, manager: User, organization:
     try:
         from datetime import datetime, timedelta
         
+        # 所有示例数据共用同一个基准时间
+        now = datetime.now()
+        
         sample_projects_data = [
             {
                 "name": "项目管理系统开发",
@@ -237,8 +245,8 @@ async def create_sample_projects(db: AsyncSession, manager: User, organization:
                 "progress": 65,
                 "budget": 500000.00,
                 "actual_cost": 320000.00,
-                "start_date": datetime.now() - timedelta(days=30),
-                "end_date": datetime.now() + timedelta(days=60)
+                "start_date": now - timedelta(days=30),
+                "end_date": now + timedelta(days=60)
             },
             {
                 "name": "移动端APP开发",
@@ -248,8 +256,8 @@ async def create_sample_projects(db: AsyncSession, manager: User, organization:
                 "progress": 15,
                 "budget": 300000.00,
                 "actual_cost": 45000.00,
-                "start_date": datetime.now() + timedelta(days=15),
-                "end_date": datetime.now() + timedelta(days=120)
+                "start_date": now + timedelta(days=15),
+                "end_date": now + timedelta(days=120)
             },
             {
                 "name": "数据分析平台",
@@ -259,21 +267,24 @@ async def create_sample_projects(db: AsyncSession, manager: User, organization:
                 "progress": 100,
                 "budget": 200000.00,
                 "actual_cost": 185000.00,
-                "start_date": datetime.now() - timedelta(days=90),
-                "end_date": datetime.now() - timedelta(days=10)
+                "start_date": now - timedelta(days=90),
+                "end_date": now - timedelta(days=10)
             }
         ]
         
+        # 一次IN查询取出所有已存在的项目，避免逐个查询
+        result = await db.execute(
+            select(Project).where(Project.name.in_([p["name"] for p in sample_projects_data]))
+        )
+        existing_projects = {project.name: project for project in result.scalars()}
+        
         created_projects = []
+        new_projects = []
         for project_data in sample_projects_data:
-            # 检查项目是否已存在
-            result = await db.execute(
-                select(Project).where(Project.name == project_data["name"])
-            )
-            existing_project = result.scalar_one_or_none()
+            existing_project = existing_projects.get(project_data["name"])
             
             if existing_project:
-                logger.info(f"项目 {project_data['name']} 已存在")
+                logger.info("项目 %s 已存在", project_data['name'])
                 created_projects.append(existing_project)
                 continue
             
@@ -291,24 +302,26 @@ async def create_sample_projects(db: AsyncSession, manager: User, organization:
                 organization_id=organization.id
             )
             
-            # 添加项目成员
-            for user in users[:3]:  # 添加前3个用户作为项目成员
-                project.members.append(user)
-            
-            db.add(project)
+            new_projects.append(project)
             created_projects.append(project)
         
-        await db.commit()
+        db.add_all(new_projects)
+        await db.flush()
         
-        # 刷新所有项目对象
-        for project in created_projects:
-            await db.refresh(project)
+        # 添加项目成员（前3个用户）：直接对关联表做一次批量INSERT，不经过ORM关系集合
+        member_rows = [
+            {"project_id": project.id, "user_id": user.id}
+            for project in new_projects
+            for user in users[:3]
+        ]
+        if member_rows:
+            await db.execute(insert(project_members), member_rows)
         
-        logger.info(f"创建了 {len(created_projects)} 个示例项目")
+        logger.info("创建了 %s 个示例项目", len(created_projects))
         return created_projects
         
     except Exception as e:
-        logger.error(f"创建示例项目失败: {e}")
+        logger.error("创建示例项目失败: %s", e)
         await db.rollback()
         raise
 
@@ -317,6 +330,9 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
     try:
         from datetime import datetime, timedelta
         
+        # 所有示例数据共用同一个基准时间
+        now = datetime.now()
+        
         # 为第一个项目创建任务
         if projects:
             project = projects[0]  # 项目管理系统开发
@@ -329,8 +345,8 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "high",
                     "type": "analysis",
                     "estimated_hours": 40.0,
-                    "due_date": datetime.now() - timedelta(days=20),
-                    "completed_date": datetime.now() - timedelta(days=18),
+                    "due_date": now - timedelta(days=20),
+                    "completed_date": now - timedelta(days=18),
                     "tags": ["需求", "分析", "文档"]
                 },
                 {
@@ -340,8 +356,8 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "high",
                     "type": "design",
                     "estimated_hours": 60.0,
-                    "due_date": datetime.now() - timedelta(days=15),
-                    "completed_date": datetime.now() - timedelta(days=12),
+                    "due_date": now - timedelta(days=15),
+                    "completed_date": now - timedelta(days=12),
                     "tags": ["架构", "设计", "数据库"]
                 },
                 {
@@ -351,8 +367,8 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "high",
                     "type": "development",
                     "estimated_hours": 80.0,
-                    "due_date": datetime.now() - timedelta(days=5),
-                    "completed_date": datetime.now() - timedelta(days=3),
+                    "due_date": now - timedelta(days=5),
+                    "completed_date": now - timedelta(days=3),
                     "tags": ["开发", "用户管理", "认证"]
                 },
                 {
@@ -362,7 +378,7 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "high",
                     "type": "development",
                     "estimated_hours": 100.0,
-                    "due_date": datetime.now() + timedelta(days=10),
+                    "due_date": now + timedelta(days=10),
                     "tags": ["开发", "项目管理"]
                 },
                 {
@@ -372,7 +388,7 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "medium",
                     "type": "development",
                     "estimated_hours": 120.0,
-                    "due_date": datetime.now() + timedelta(days=20),
+                    "due_date": now + timedelta(days=20),
                     "tags": ["开发", "任务管理"]
                 },
                 {
@@ -382,7 +398,7 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "medium",
                     "type": "development",
                     "estimated_hours": 150.0,
-                    "due_date": datetime.now() + timedelta(days=25),
+                    "due_date": now + timedelta(days=25),
                     "tags": ["前端", "UI", "响应式"]
                 },
                 {
@@ -392,7 +408,7 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "high",
                     "type": "testing",
                     "estimated_hours": 80.0,
-                    "due_date": datetime.now() + timedelta(days=35),
+                    "due_date": now + timedelta(days=35),
                     "tags": ["测试", "质量保证"]
                 },
                 {
@@ -402,31 +418,33 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     "priority": "medium",
                     "type": "deployment",
                     "estimated_hours": 30.0,
-                    "due_date": datetime.now() + timedelta(days=45),
+                    "due_date": now + timedelta(days=45),
                     "tags": ["部署", "运维"]
                 }
             ]
             
-            created_tasks = []
-            for i, task_data in enumerate(sample_tasks_data):
-                # 检查任务是否已存在
-                result = await db.execute(
-                    select(Task).where(
-                        Task.title == task_data["title"],
-                        Task.project_id == project.id
-                    )
+            # 一次IN查询取出该项目下所有已存在的任务，避免逐个查询
+            result = await db.execute(
+                select(Task).where(
+                    Task.project_id == project.id,
+                    Task.title.in_([t["title"] for t in sample_tasks_data])
                 )
-                existing_task = result.scalar_one_or_none()
+            )
+            existing_tasks = {task.title: task for task in result.scalars()}
+            
+            created_tasks = []
+            new_tasks = []
+            # 分配任务给不同的用户：按顺序轮流分配（已存在的任务同样占位，保持分配顺序不变）
+            assignees = cycle(users) if users else repeat(None)
+            reporter = users[0] if users else None  # 第一个用户作为报告人
+            for task_data, assignee in zip(sample_tasks_data, assignees):
+                existing_task = existing_tasks.get(task_data["title"])
                 
                 if existing_task:
-                    logger.info(f"任务 {task_data['title']} 已存在")
+                    logger.info("任务 %s 已存在", task_data['title'])
                     created_tasks.append(existing_task)
                     continue
                 
-                # 分配任务给不同的用户
-                assignee = users[i % len(users)] if users else None
-                reporter = users[0] if users else None  # 第一个用户作为报告人
-                
                 task = Task(
                     title=task_data["title"],
                     description=task_data["description"],
@@ -442,22 +460,19 @@ async def create_sample_tasks(db: AsyncSession, projects: list, users: list):
                     tags=task_data["tags"]
                 )
                 
-                db.add(task)
+                new_tasks.append(task)
                 created_tasks.append(task)
             
-            await db.commit()
-            
-            # 刷新所有任务对象
-            for task in created_tasks:
-                await db.refresh(task)
+            db.add_all(new_tasks)
+            await db.flush()
             
-            logger.info(f"为项目 {project.name} 创建了 {len(created_tasks)} 个示例任务")
+            logger.info("为项目 %s 创建了 %s 个示例任务", project.name, len(created_tasks))
             return created_tasks
         
         return []
         
     except Exception as e:
-        logger.error(f"创建示例任务失败: {e}")
+        logger.error("创建示例任务失败: %s", e)
         await db.rollback()
         raise
 
@@ -494,11 +509,14 @@ async def init_database():
                 
                 # 创建示例任务
                 await create_sample_tasks(db, projects, sample_users)
+                
+                # 各步骤只flush，全部示例数据在同一个事务中一次提交
+                await db.commit()
         
         logger.info("数据库初始化完成")
         
     except Exception as e:
-        logger.error(f"数据库初始化失败: {e}")
+        logger.error("数据库初始化失败: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -1,18 +1,19 @@
 import logging
 import logging.handlers
+import re
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 from app.core.config import settings
 import json
-from datetime import datetime
 
 class JSONFormatter(logging.Formatter):
     """JSON格式的日志格式化器"""
     
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -104,10 +105,14 @@ class SensitiveDataFilter(logging.Filter):
         'password', 'token', 'secret', 'key', 'authorization',
         'cookie', 'session', 'csrf', 'api_key'
     ]
+    # 预编译的敏感字段匹配，绝大多数日志一次扫描即可判定无需处理
+    SENSITIVE_PATTERN = re.compile('|'.join(map(re.escape, SENSITIVE_FIELDS)))
     
     def filter(self, record: logging.LogRecord) -> bool:
         # 检查并替换敏感信息
         message = record.getMessage().lower()
+        if not self.SENSITIVE_PATTERN.search(message):
+            return True
         
         for field in self.SENSITIVE_FIELDS:
             if field in message:
@@ -333,11 +338,12 @@ def log_function_call(logger: logging.Logger = None):
     def decorator(func):
         import functools
         
+        # 日志记录器和函数全名在装饰时确定，避免每次调用重复计算
+        func_logger = logger or logging.getLogger(func.__module__)
+        func_name = f"{func.__module__}.{func.__name__}"
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            func_logger = logger or logging.getLogger(func.__module__)
-            func_name = f"{func.__module__}.{func.__name__}"
-            
             func_logger.debug(f"Calling function: {func_name}")
             
             try:
@@ -359,11 +365,11 @@ def log_async_function_call(logger: logging.Logger = None):
     def decorator(func):
         import functools
         
+        func_logger = logger or logging.getLogger(func.__module__)
+        func_name = f"{func.__module__}.{func.__name__}"
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            func_logger = logger or logging.getLogger(func.__module__)
-            func_name = f"{func.__module__}.{func.__name__}"
-            
             func_logger.debug(f"Calling async function: {func_name}")
             
             try:
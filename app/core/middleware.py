@@ -1,7 +1,5 @@
 from fastapi import Request, Response, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
@@ -9,6 +7,7 @@ from starlette.middleware.sessions import SessionMiddleware
 from starlette.responses import JSONResponse
 import time
 import uuid
+import hashlib
 import json
 import asyncio
 from typing import Callable, Dict, Any, Optional, List
@@ -53,7 +52,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         if request.url.path in self.exclude_paths:
             return await call_next(request)
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 获取请求信息
         method = request.method
@@ -77,7 +76,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
             
             # 计算响应时间
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
             
             # 记录请求完成
             app_logger.api_logger.info(
@@ -104,7 +103,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             # 计算响应时间
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
             
             # 记录请求错误
             app_logger.api_logger.error(
@@ -381,9 +380,9 @@ class CacheMiddleware(BaseHTTPMiddleware):
         # 尝试从缓存获取响应
         if redis_client:
             try:
-                cached_response = await redis_client.get(cache_key)
-                if cached_response:
-                    response_data = json.loads(cached_response)
+                # 缓存值由redis_client按类型标记反序列化，直接得到字典
+                response_data = await redis_client.get(cache_key)
+                if response_data:
                     return JSONResponse(
                         content=response_data["content"],
                         status_code=response_data["status_code"],
@@ -413,12 +412,8 @@ class CacheMiddleware(BaseHTTPMiddleware):
                     "headers": dict(response.headers)
                 }
                 
-                # 存储到缓存
-                await redis_client.setex(
-                    cache_key,
-                    self.cache_ttl,
-                    json.dumps(cache_data)
-                )
+                # 存储到缓存（直接交给redis_client序列化，避免再套一层JSON字符串）
+                await redis_client.set(cache_key, cache_data, expire=self.cache_ttl)
                 
                 # 重新创建响应
                 response = JSONResponse(
@@ -435,10 +430,14 @@ class CacheMiddleware(BaseHTTPMiddleware):
     def _generate_cache_key(self, request: Request) -> str:
         """生成缓存键"""
         # 包含路径、查询参数和用户信息
+        query_digest = hashlib.blake2b(
+            str(sorted(request.query_params.items())).encode("utf-8"),
+            digest_size=8
+        ).hexdigest()
         key_parts = [
             "cache",
             request.url.path,
-            str(sorted(request.query_params.items())),
+            query_digest,
         ]
         
         # 如果有用户信息，包含用户ID
@@ -446,6 +445,19 @@ class CacheMiddleware(BaseHTTPMiddleware):
         if user_id:
             key_parts.append(f"user:{user_id}")
         
+        # 认证在路由依赖中完成，中间件阶段通常拿不到user_id；
+        # 按请求携带的凭据区分缓存，避免已认证的响应被其他用户命中
+        credentials = [
+            request.headers.get(header)
+            for header in ("authorization", "x-api-key", "cookie")
+        ]
+        if any(credentials):
+            credential_digest = hashlib.blake2b(
+                "\n".join(value or "" for value in credentials).encode("utf-8"),
+                digest_size=16
+            ).hexdigest()
+            key_parts.append(f"auth:{credential_digest}")
+        
         return ":".join(key_parts)
 
 class CompressionMiddleware(BaseHTTPMiddleware):
@@ -585,11 +597,11 @@ def monitor_performance(threshold: float = 1.0):
         
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             try:
                 result = await func(*args, **kwargs)
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 
                 # 记录慢操作
                 if execution_time > threshold:
@@ -601,7 +613,7 @@ def monitor_performance(threshold: float = 1.0):
                 
                 return result
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 logging.error(
                     f"Function {func.__name__} failed after {execution_time:.3f}s: {str(e)}"
                 )
@@ -1,28 +1,84 @@
 import redis.asyncio as redis
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List, Tuple, Callable, Awaitable, Iterable
+import asyncio
+import secrets
 import json
+import logging
+from fnmatch import fnmatchcase
+from itertools import islice
 import pickle
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# 负缓存标记：表示数据已确认不存在，用于短时间内避免重复回源查询
+NEGATIVE_CACHE = object()
+
+# 超过阈值的缓存值放到线程中(反)序列化，避免大对象阻塞事件循环
+OFFLOAD_PAYLOAD_BYTES = 4096
+OFFLOAD_CONTAINER_ITEMS = 256
+
+# 类型标记前缀：0xff不会出现在UTF-8文本中，pickle数据以0x80开头，
+# 因此旧格式的JSON/字符串/pickle值不会被误判为新格式
+CACHE_TAG_PREFIX = b'\xff'
+
+# 释放回源锁：只有锁的值仍是自己的令牌时才删除，避免误删锁过期后被其他请求重新获得的锁
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
 class RedisClient:
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
+        self.pool: Optional[redis.ConnectionPool] = None
+        # 后台写入队列：set(wait=False)入队后立即返回，由后台任务批量流水线写入。
+        # 队列中只放键，待写入的值保存在_pending中；删除或同步写入时直接丢弃对应的待写值，
+        # 无需等待整个队列落盘。已取出正在提交的键记录在_inflight中，提交期间被删除的键
+        # 标记为True，由后台任务在该批落盘后再次UNLINK，避免旧值在删除之后被写回
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, Tuple[bytes, int]] = {}
+        self._inflight: Dict[str, bool] = {}
     
     async def connect(self):
-        """连接Redis"""
-        self.redis = redis.from_url(
+        """连接Redis（全局复用同一个连接池和客户端实例）"""
+        if self.redis:
+            return self.redis
+
+        self.pool = redis.ConnectionPool.from_url(
             settings.REDIS_URL,
+            password=settings.REDIS_PASSWORD,
             encoding="utf-8",
             decode_responses=False,  # 为了支持pickle序列化
             socket_connect_timeout=5,
-            socket_timeout=5
+            socket_timeout=5,
+            socket_keepalive=True,
+            health_check_interval=30,
+            max_connections=settings.REDIS_POOL_SIZE
         )
+        self.redis = redis.Redis(connection_pool=self.pool)
+        self._write_queue = asyncio.Queue(maxsize=10000)
+        self._writer_task = asyncio.create_task(self._drain_writes())
         return self.redis
     
     async def disconnect(self):
         """断开Redis连接"""
+        if self._writer_task:
+            await self.flush()
+            self._writer_task.cancel()
+            self._writer_task = None
+            self._write_queue = None
+            self._pending.clear()
+            self._inflight.clear()
         if self.redis:
-            await self.redis.close()
+            await self.redis.aclose()
+            self.redis = None
+        if self.pool:
+            await self.pool.disconnect()
+            self.pool = None
     
     async def ping(self) -> bool:
         """测试连接"""
@@ -30,35 +86,54 @@ class RedisClient:
             await self.connect()
         return await self.redis.ping()
     
-    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
-        """设置缓存"""
-        if not self.redis:
-            await self.connect()
-        
-        # 序列化数据
+    def _serialize(self, value: Any) -> bytes:
+        """序列化缓存值（前两个字节为类型标记，读取时无需逐个尝试反序列化）"""
+        if value is NEGATIVE_CACHE:
+            return CACHE_TAG_PREFIX + b'M'
         if isinstance(value, (dict, list)):
-            serialized_value = json.dumps(value, ensure_ascii=False)
+            return CACHE_TAG_PREFIX + b'J' + json.dumps(value, ensure_ascii=False).encode('utf-8')
         elif isinstance(value, str):
-            serialized_value = value
+            return CACHE_TAG_PREFIX + b'S' + value.encode('utf-8')
+        elif isinstance(value, bytes):
+            return CACHE_TAG_PREFIX + b'B' + value
+        elif type(value) is int:
+            return CACHE_TAG_PREFIX + b'I' + str(value).encode('ascii')
         else:
-            serialized_value = pickle.dumps(value)
-        
-        return await self.redis.set(
-            key, 
-            serialized_value, 
-            ex=expire or settings.CACHE_EXPIRE_SECONDS
-        )
-    
-    async def get(self, key: str) -> Any:
-        """获取缓存"""
-        if not self.redis:
-            await self.connect()
-        
-        value = await self.redis.get(key)
-        if value is None:
-            return None
-        
-        # 尝试反序列化
+            return CACHE_TAG_PREFIX + b'P' + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _deserialize(self, value: bytes) -> Any:
+        """根据类型标记反序列化缓存值"""
+        if value[:1] != CACHE_TAG_PREFIX:
+            return self._deserialize_legacy(value)
+        tag, body = value[1:2], value[2:]
+        if tag == b'M':
+            return NEGATIVE_CACHE
+        if tag == b'J':
+            return json.loads(body)
+        if tag == b'S':
+            return body.decode('utf-8')
+        if tag == b'B':
+            return body
+        if tag == b'I':
+            return int(body)
+        if tag == b'P':
+            return pickle.loads(body)
+        return self._deserialize_legacy(value)
+
+    async def _serialize_async(self, value: Any) -> bytes:
+        """序列化缓存值，大容器在线程中处理"""
+        if isinstance(value, (dict, list)) and len(value) > OFFLOAD_CONTAINER_ITEMS:
+            return await asyncio.to_thread(self._serialize, value)
+        return self._serialize(value)
+
+    async def _deserialize_async(self, value: bytes) -> Any:
+        """反序列化缓存值，大数据在线程中处理"""
+        if len(value) > OFFLOAD_PAYLOAD_BYTES:
+            return await asyncio.to_thread(self._deserialize, value)
+        return self._deserialize(value)
+
+    def _deserialize_legacy(self, value: bytes) -> Any:
+        """反序列化无类型标记的旧格式缓存值"""
         try:
             # 先尝试JSON
             return json.loads(value)
@@ -69,13 +144,253 @@ class RedisClient:
             except:
                 # 最后返回原始字符串
                 return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    async def _drain_writes(self, batch_size: int = 100):
+        """后台消费写入队列，每批通过一次流水线提交"""
+        while True:
+            keys = [await self._write_queue.get()]
+            while len(keys) < batch_size and not self._write_queue.empty():
+                keys.append(self._write_queue.get_nowait())
+            
+            try:
+                # 已被删除或被同步写入覆盖的键不再写入
+                entries = [
+                    (key, entry) for key in keys
+                    if (entry := self._pending.pop(key, None)) is not None
+                ]
+                if entries:
+                    pipe = self.pipeline()
+                    for key, (payload, expire) in entries:
+                        pipe.set(key, payload, ex=expire)
+                        self._inflight[key] = False
+                    try:
+                        batch_results = await pipe.execute(raise_on_error=False)
+                        failed = sum(isinstance(result, Exception) for result in batch_results)
+                        if failed:
+                            logger.error(f"后台缓存写入失败 {failed}/{len(batch_results)} 条")
+                    finally:
+                        # 提交期间被删除的键，其DEL可能先于本批SET到达Redis，需要再删除一次
+                        stale = [key for key, _ in entries if self._inflight.pop(key, False)]
+                        if stale:
+                            await self.redis.unlink(*stale)
+            except Exception as e:
+                logger.error(f"后台缓存写入失败: {e}")
+            finally:
+                for _ in keys:
+                    self._write_queue.task_done()
+
+    async def flush(self):
+        """等待后台写入队列中的缓存全部落盘"""
+        if self._write_queue and self._writer_task and not self._writer_task.done():
+            await self._write_queue.join()
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        expire: Optional[int] = None,
+        wait: bool = True,
+        nx: bool = False
+    ) -> bool:
+        """设置缓存（默认等待Redis确认）
+        
+        wait=False时入队由后台批量写入，调用方立即返回，只适用于丢失或延迟写入无影响的缓存回填；
+        nx=True时仅在键不存在时写入（SET NX），需要写入结果，因此不走后台队列
+        """
+        if not self.redis:
+            await self.connect()
+        
+        payload = await self._serialize_async(value)
+        expire = expire or settings.CACHE_EXPIRE_SECONDS
+        
+        if not wait and not nx and self._writer_task and not self._writer_task.done():
+            if key in self._pending:
+                # 该键已在队列中，只需替换待写入的值
+                self._pending[key] = (payload, expire)
+                return True
+            try:
+                self._write_queue.put_nowait(key)
+                self._pending[key] = (payload, expire)
+                return True
+            except asyncio.QueueFull:
+                pass
+        
+        # 同步写入以本次的值为准，丢弃排队中的旧值；NX写入可能被跳过，保留排队中的值
+        if not nx:
+            self._pending.pop(key, None)
+        return bool(await self.redis.set(key, payload, ex=expire, nx=nx))
+    
+    async def get(self, key: str, default: Any = None, refresh_expire: Optional[int] = None) -> Any:
+        """获取缓存，未命中时返回default（可传入哨兵对象以区分缓存的None值）
+        
+        refresh_expire不为空时使用GETEX在读取的同时刷新过期时间（滑动过期）
+        """
+        if not self.redis:
+            await self.connect()
+        
+        # 尚未落盘的后台写入对本进程立即可见
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await self._deserialize_async(pending[0])
+        
+        if refresh_expire:
+            value = await self.redis.getex(key, ex=refresh_expire)
+        else:
+            value = await self.redis.get(key)
+        if value is None:
+            return default
+        
+        return await self._deserialize_async(value)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire: Optional[int] = None,
+        lock_timeout: int = 10,
+        wait_timeout: float = 5.0
+    ) -> Any:
+        """获取缓存，未命中时只由获得锁（SET NX EX）的请求回源计算，其余请求等待其结果，防止缓存击穿
+        
+        锁的值为本次请求的随机令牌，释放时通过Lua脚本比较后再删除
+        """
+        missing = object()
+        value = await self.get(key, missing)
+        if value is not missing:
+            return value
+        
+        lock_key = f"lock:{key}"
+        token = secrets.token_hex(16)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait_timeout
+        delay = 0.05
+        while not await self.redis.set(lock_key, token, ex=lock_timeout, nx=True):
+            if loop.time() >= deadline:
+                # 等待超时，直接回源
+                return await loader()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            value = await self.get(key, missing)
+            if value is not missing:
+                return value
+        
+        try:
+            value = await loader()
+            await self.set(key, value, expire)
+            return value
+        finally:
+            await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    def _invalidate_pending(self, keys: Iterable[str]):
+        """丢弃排队中的写入，并标记正在提交的写入需要在落盘后重新删除"""
+        for key in keys:
+            self._pending.pop(key, None)
+            if key in self._inflight:
+                self._inflight[key] = True
+
+    def pipeline(self, transaction: bool = False):
+        """获取流水线，批量命令一次往返提交（需先调用connect）"""
+        return self.redis.pipeline(transaction=transaction)
+
+    async def mget(self, keys: List[str], default: Any = None, batch_size: int = 500) -> List[Any]:
+        """批量获取缓存（每batch_size个键一次MGET），未命中的位置为default"""
+        if not keys:
+            return []
+        if not self.redis:
+            await self.connect()
+
+        results = []
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            values = await self.redis.mget(batch)
+            for key, value in zip(batch, values):
+                # 与get一致：尚未落盘的后台写入对本进程立即可见
+                pending = self._pending.get(key)
+                if pending is not None:
+                    value = pending[0]
+                results.append(default if value is None else await self._deserialize_async(value))
+        return results
+
+    async def mset(
+        self,
+        items: Iterable[Tuple[str, Any, Optional[int]]],
+        batch_size: int = 500,
+        nx: bool = False
+    ) -> List[bool]:
+        """批量设置缓存，items为(key, value, expire)的可迭代对象（可为生成器），每batch_size条通过流水线提交一次
+        
+        按批从items中取数据，生成器数据源不会被整体物化，峰值内存只与batch_size相关；
+        nx=True时跳过已存在的键（SET NX），对应位置返回False，适合幂等预热
+        """
+        if not self.redis:
+            await self.connect()
+
+        items = iter(items)
+        results = []
+        while batch := list(islice(items, batch_size)):
+            pipe = self.pipeline()
+            for key, value, expire in batch:
+                if not nx:
+                    self._pending.pop(key, None)
+                pipe.set(key, await self._serialize_async(value), ex=expire or settings.CACHE_EXPIRE_SECONDS, nx=nx)
+            # 单条命令失败不中断整批，在批次边界统一统计并记录
+            batch_results = await pipe.execute(raise_on_error=False)
+            failed = sum(isinstance(result, Exception) for result in batch_results)
+            if failed:
+                logger.error(f"批量缓存写入失败 {failed}/{len(batch_results)} 条")
+            results.extend(
+                False if isinstance(result, Exception) else bool(result)
+                for result in batch_results
+            )
+        return results
     
     async def delete(self, key: str) -> bool:
         """删除缓存"""
         if not self.redis:
             await self.connect()
+        # 丢弃排队中的写入，避免旧值在删除之后被写回
+        self._invalidate_pending([key])
         return bool(await self.redis.delete(key))
-    
+
+    async def delete_many(self, keys: List[str], batch_size: int = 500) -> int:
+        """批量删除缓存，每batch_size个键一条UNLINK（内存由Redis后台线程释放），返回删除数量"""
+        if not keys:
+            return 0
+        if not self.redis:
+            await self.connect()
+        self._invalidate_pending(keys)
+
+        deleted = 0
+        for start in range(0, len(keys), batch_size):
+            deleted += await self.redis.unlink(*keys[start:start + batch_size])
+        return deleted
+
+    async def scan_keys(self, pattern: str, count: int = 500) -> List[bytes]:
+        """按模式获取键（SCAN游标分批遍历，避免KEYS阻塞Redis）"""
+        if not self.redis:
+            await self.connect()
+        return [key async for key in self.redis.scan_iter(match=pattern, count=count)]
+
+    async def clear_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """按模式批量删除缓存（SCAN遍历 + 分批UNLINK，避免KEYS和DEL阻塞Redis）"""
+        if not self.redis:
+            await self.connect()
+        # 丢弃排队中及正在提交的匹配该模式的写入（Redis的glob模式与fnmatch基本一致）
+        self._invalidate_pending([
+            key for key in [*self._pending, *self._inflight] if fnmatchcase(key, pattern)
+        ])
+
+        deleted = 0
+        batch = []
+        async for key in self.redis.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += await self.redis.unlink(*batch)
+                batch.clear()
+        if batch:
+            deleted += await self.redis.unlink(*batch)
+        return deleted
+
     async def exists(self, key: str) -> bool:
         """检查键是否存在"""
         if not self.redis:
@@ -11,6 +11,10 @@ from app.core.config import settings
 # 密码加密上下文
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 预编译的格式校验正则
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_RE = re.compile(r'^1[3-9]\d{9}$')
+
 def create_access_token(
     subject: Union[str, Any], 
     expires_delta: timedelta = None
@@ -392,15 +396,13 @@ class SecurityUtils:
     @staticmethod
     def validate_email(email: str) -> bool:
         """验证邮箱格式"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.match(email) is not None
     
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """验证手机号格式"""
         # 简单的中国手机号验证
-        pattern = r'^1[3-9]\d{9}$'
-        return re.match(pattern, phone) is not None
+        return _PHONE_RE.match(phone) is not None
     
     @staticmethod
     def generate_secure_filename(original_filename: str) -> str:
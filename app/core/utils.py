@@ -5,7 +5,9 @@ import uuid
 import re
 import json
 import base64
+import logging
 import mimetypes
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Union, Tuple, Type
 from pathlib import Path
@@ -16,8 +18,6 @@ from email.mime.base import MIMEBase
 from email import encoders
 import asyncio
 import aiofiles
-import aiohttp
-from PIL import Image
 import io
 from decimal import Decimal
 from sqlalchemy.orm import Session
@@ -26,6 +26,8 @@ from pydantic import BaseModel
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # 字符串工具函数
 def generate_random_string(length: int = 32, include_symbols: bool = False) -> str:
     """生成随机字符串"""
@@ -78,15 +80,16 @@ def mask_sensitive_data(data: str, mask_char: str = "*", visible_chars: int = 4)
     return start + middle + end
 
 # 验证工具函数
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_RE = re.compile(r'^1[3-9]\d{9}$')
+
 def is_valid_email(email: str) -> bool:
     """验证邮箱格式"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def is_valid_phone(phone: str) -> bool:
     """验证手机号格式（中国）"""
-    pattern = r'^1[3-9]\d{9}$'
-    return re.match(pattern, phone) is not None
+    return _PHONE_RE.match(phone) is not None
 
 def is_valid_url(url: str) -> bool:
     """验证URL格式"""
@@ -152,11 +155,11 @@ def validate_password_strength(password: str) -> Dict[str, Any]:
 # 时间工具函数
 def get_current_timestamp() -> int:
     """获取当前时间戳（秒）"""
-    return int(datetime.now().timestamp())
+    return int(time.time())
 
 def get_current_timestamp_ms() -> int:
     """获取当前时间戳（毫秒）"""
-    return int(datetime.now().timestamp() * 1000)
+    return time.time_ns() // 1_000_000
 
 def timestamp_to_datetime(timestamp: Union[int, float]) -> datetime:
     """时间戳转datetime"""
@@ -273,6 +276,9 @@ async def save_uploaded_file(file_content: bytes, filename: str, upload_dir: str
 # 图片处理工具函数
 def resize_image(image_data: bytes, max_width: int = 800, max_height: int = 600, quality: int = 85) -> bytes:
     """调整图片大小"""
+    # 按需导入Pillow，只在实际处理图片时才承担其导入开销
+    from PIL import Image
+    
     try:
         # 打开图片
         image = Image.open(io.BytesIO(image_data))
@@ -303,6 +309,8 @@ def resize_image(image_data: bytes, max_width: int = 800, max_height: int = 600,
 
 def create_thumbnail(image_data: bytes, size: Tuple[int, int] = (150, 150)) -> bytes:
     """创建缩略图"""
+    from PIL import Image
+    
     try:
         image = Image.open(io.BytesIO(image_data))
         image.thumbnail(size, Image.Resampling.LANCZOS)
@@ -334,18 +342,24 @@ def deep_merge_dict(dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, A
     return result
 
 def flatten_dict(data: Dict[str, Any], parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
-    """扁平化字典"""
-    items = []
-    
-    for key, value in data.items():
-        new_key = f"{parent_key}{sep}{key}" if parent_key else key
-        
-        if isinstance(value, dict):
-            items.extend(flatten_dict(value, new_key, sep=sep).items())
+    """扁平化字典（显式栈迭代，不产生递归调用和中间字典）"""
+    result = {}
+    stack = [(parent_key, iter(data.items()))]
+    
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            new_key = f"{prefix}{sep}{key}" if prefix else key
+            
+            if isinstance(value, dict):
+                # 先处理子字典，处理完后继续当前层剩余的键，保持原有顺序
+                stack.append((new_key, iter(value.items())))
+                break
+            result[new_key] = value
         else:
-            items.append((new_key, value))
+            stack.pop()
     
-    return dict(items)
+    return result
 
 def remove_none_values(data: Dict[str, Any]) -> Dict[str, Any]:
     """移除字典中的None值"""
@@ -405,6 +419,9 @@ async def make_http_request(
     timeout: int = 30
 ) -> Dict[str, Any]:
     """发起HTTP请求"""
+    # 按需导入aiohttp，未发起外部请求的进程无需加载
+    import aiohttp
+    
     async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
         async with session.request(method, url, headers=headers, json=data) as response:
             return {
@@ -443,20 +460,20 @@ def bulk_insert_or_update(db: Session, model: Type, data: List[Dict[str, Any]],
 
 # 缓存工具函数
 def generate_cache_key(*args, **kwargs) -> str:
-    """生成缓存键"""
-    key_parts = []
+    """生成缓存键（增量哈希，不拼接中间字符串）"""
+    hasher = hashlib.blake2b(digest_size=16)
     
     # 添加位置参数
     for arg in args:
-        key_parts.append(str(arg))
+        hasher.update(str(arg).encode('utf-8'))
+        hasher.update(b':')
     
     # 添加关键字参数
     for key, value in sorted(kwargs.items()):
-        key_parts.append(f"{key}:{value}")
+        hasher.update(f"{key}={value}".encode('utf-8'))
+        hasher.update(b':')
     
-    # 生成哈希
-    key_string = ":".join(key_parts)
-    return hash_string(key_string, 'md5')
+    return hasher.hexdigest()
 
 # 配置工具函数
 def load_config_from_env(prefix: str = "APP_") -> Dict[str, str]:
@@ -471,26 +488,34 @@ def load_config_from_env(prefix: str = "APP_") -> Dict[str, str]:
     
     return config
 
+# JSON值只可能以这些字符开头；数字至少包含一位数字。
+# 先用正则分类，普通字符串不再经过抛异常的解析尝试
+_JSON_START_RE = re.compile(r'[ \t\n\r]*[{\["\-0-9tfnNI]')
+_HAS_DIGIT_RE = re.compile(r'\d')
+
 def parse_config_value(value: str) -> Any:
     """解析配置值"""
     # 尝试解析为JSON
-    try:
-        return json.loads(value)
-    except (json.JSONDecodeError, TypeError):
-        pass
+    if _JSON_START_RE.match(value):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
     
     # 尝试解析为布尔值
-    if value.lower() in ('true', 'false'):
-        return value.lower() == 'true'
+    lowered = value.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
     
     # 尝试解析为数字
-    try:
-        if '.' in value:
-            return float(value)
-        else:
-            return int(value)
-    except ValueError:
-        pass
+    if _HAS_DIGIT_RE.search(value):
+        try:
+            if '.' in value:
+                return float(value)
+            else:
+                return int(value)
+        except ValueError:
+            pass
     
     # 返回字符串
     return value
@@ -508,19 +533,12 @@ def log_execution_time(func_name: str, start_time: float, end_time: float, thres
     execution_time = end_time - start_time
     
     if execution_time > threshold:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"Slow execution: {func_name} took {execution_time:.3f}s")
+        logger.warning("Slow execution: %s took %.3fs", func_name, execution_time)
 
 # 异步工具函数
 async def run_in_threadpool(func, *args, **kwargs):
-    """在线程池中运行同步函数"""
-    import asyncio
-    import concurrent.futures
-    
-    loop = asyncio.get_event_loop()
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        return await loop.run_in_executor(executor, func, *args, **kwargs)
+    """在线程池中运行同步函数（复用事件循环的默认线程池，不再每次调用新建线程池）"""
+    return await asyncio.to_thread(func, *args, **kwargs)
 
 async def gather_with_concurrency(n: int, *tasks):
     """限制并发数的gather"""
@@ -589,18 +607,18 @@ class Timer:
         self.end_time = None
     
     def __enter__(self):
-        self.start_time = datetime.now()
+        # 使用单调高精度时钟计时，不受系统时间调整影响
+        self.start_time = time.perf_counter()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.end_time = datetime.now()
-        duration = (self.end_time - self.start_time).total_seconds()
-        print(f"{self.name}: {duration:.3f}s")
+        self.end_time = time.perf_counter()
+        logger.info("%s: %.3fs", self.name, self.elapsed)
     
     @property
     def elapsed(self) -> float:
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        if self.start_time is not None and self.end_time is not None:
+            return self.end_time - self.start_time
         return 0.0
 
 # 重试装饰器
@@ -629,7 +647,6 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
                 except Exception as e:
                     last_exception = e
                     if attempt < max_attempts - 1:
-                        import time
                         time.sleep(delay * (backoff ** attempt))
                     else:
                         raise last_exception
@@ -31,9 +31,13 @@ async def lifespan(app: FastAPI):
         # 初始化Redis连接
         await redis_client.connect()
         logger.info("Redis connection initialized")
-        
 
-        
+        # 预热CPU采样：cpu_percent(interval=None)首次调用固定返回0.0，
+        # 启动时先调用一次，/metrics的第一次抓取即可得到有效数据
+        import psutil
+        psutil.cpu_percent(interval=None)
+
+
         # 初始化数据库数据
         if settings.INIT_DB_ON_STARTUP:
             logger.info("Initializing database data...")
@@ -107,6 +111,9 @@ async def system_info():
     import platform
     from datetime import datetime
     
+    # 只采样一次内存信息，total和available来自同一快照
+    memory = psutil.virtual_memory()
+    
     return {
         "app_name": settings.APP_NAME,
         "version": settings.VERSION,
@@ -114,8 +121,8 @@ async def system_info():
         "python_version": platform.python_version(),
         "platform": platform.platform(),
         "cpu_count": psutil.cpu_count(),
-        "memory_total": psutil.virtual_memory().total,
-        "memory_available": psutil.virtual_memory().available,
+        "memory_total": memory.total,
+        "memory_available": memory.available,
         "disk_usage": psutil.disk_usage('/').percent,
         "uptime": datetime.now().isoformat()
     }
@@ -128,7 +135,8 @@ async def metrics():
     from app.core.redis_client import redis_client
     
     metrics_data = {
-        "cpu_percent": psutil.cpu_percent(interval=1),
+        # 非阻塞采样：返回距上次调用以来的CPU占用，不再让请求阻塞1秒
+        "cpu_percent": psutil.cpu_percent(interval=None),
         "memory_percent": psutil.virtual_memory().percent,
         "disk_percent": psutil.disk_usage('/').percent,
         "active_connections": 0,  # 这里可以添加实际的连接数统计
@@ -179,9 +187,9 @@ if settings.SERVE_UPLOAD_FILES:
 async def add_process_time_header(request: Request, call_next):
     """添加处理时间头"""
     import time
-    start_time = time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
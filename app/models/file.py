@@ -6,7 +6,7 @@ from app.core.database import Base
 class File(Base):
     __tablename__ = "files"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     filename = Column(String, nullable=False)
     filepath = Column(String, nullable=False)
     file_type = Column(String, nullable=True)
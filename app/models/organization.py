@@ -6,7 +6,7 @@ from app.core.database import Base
 class Organization(Base):
     __tablename__ = "organizations"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     name = Column(String, unique=True, index=True, nullable=False)
     description = Column(String, nullable=True)
     type = Column(String, nullable=False) # e.g., company, department, team
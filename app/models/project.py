@@ -6,7 +6,7 @@ from app.core.database import Base
 class Project(Base):
     __tablename__ = "projects"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     name = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(String, default="pending", nullable=False) # e.g., pending, in_progress, completed, cancelled
@@ -1,12 +1,25 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    # 复合索引：等值过滤列在前（选择性高的在最左），排序/范围列在后
+    __table_args__ = (
+        Index("idx_task_project_status", "project_id", "status"),
+        Index("idx_task_assignee_status", "assigned_to_id", "status"),
+        # PostgreSQL覆盖索引：附带状态和优先级，按项目统计时可走仅索引扫描（其他数据库忽略该参数）
+        Index(
+            "idx_task_project_created", "project_id", "created_at",
+            postgresql_include=["status", "priority"]
+        ),
+        # 任务按创建时间追加写入，PostgreSQL上用BRIN索引支持时间范围查询，体积远小于B-tree；
+        # 仅在PostgreSQL上创建，其他数据库上会退化为普通B-tree，徒增写入开销
+        Index("idx_task_created_brin", "created_at", postgresql_using="brin").ddl_if(dialect="postgresql"),
+    )
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(String, default="todo", nullable=False) # e.g., todo, in_progress, done, blocked